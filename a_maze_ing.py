@@ -1,7 +1,6 @@
+import os
 import sys
 from config.loader import load_config
-from mazegen.generator import MazeGenerator
-from visuals.tui import MazeApp
 
 
 def main():
@@ -25,6 +24,16 @@ def main():
     entry = config['ENTRY']
     exit_point = config['EXIT']
     is_perfect = config.get('PERFECT', True)
+    output_file = config['OUTPUT_FILE']
+    # Animation start/end toasts, e.g. MAZE_VERBOSE=1
+    verbose = os.environ.get('MAZE_VERBOSE', '').lower() in (
+        '1', 'true', 'yes', 'on')
+
+    # Heavy imports (NumPy, Textual) only once the config is known good,
+    # so a bad config path or value fails fast.
+    from mazegen.generator import MazeGenerator
+    from visuals.tui import MazeApp
+
     # 3. Initialize Generator Logic
     # We create the instance, but we don't run .generate() yet.
     # The App will handle that.
@@ -37,7 +46,8 @@ def main():
 
     # 4. Launch the Visualization
     # The App takes ownership of the generator instance.
-    app = MazeApp(maze_gen, entry, exit_point, is_perfect)
+    app = MazeApp(maze_gen, entry, exit_point, is_perfect, output_file,
+                  verbose=verbose)
     app.run()
 
 
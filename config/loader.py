@@ -5,6 +5,9 @@ MANDATORY_KEYS = {
     "WIDTH", "HEIGHT", "ENTRY", "EXIT", "PERFECT", "OUTPUT_FILE"
 }
 
+_TRUE_VALUES = frozenset({'true', '1', 'yes', 'on'})
+_FALSE_VALUES = frozenset({'false', '0', 'no', 'off'})
+
 
 def load_config(filepath: str) -> Dict[str, Any]:
     raw_config = _read_and_parse_raw_file(filepath)
@@ -16,8 +19,9 @@ def _read_and_parse_raw_file(filepath: str) -> Dict[str, str]:
     raw_config = {}
 
     try:
+        # One read and one split: no per-line '\n'-terminated copies
         with open(filepath, 'r') as f:
-            lines = f.readlines()
+            lines = f.read().splitlines()
     except FileNotFoundError:
         print(f"Error: Configuration file '{filepath}' not found.")
         sys.exit(1)
@@ -113,13 +117,11 @@ def _parse_bool(value: str) -> bool:
     Robust boolean parsing.
     Accepts: 'true', '1', 'yes', 'on' (case insensitive).
     """
-    true_values = {'true', '1', 'yes', 'on'}
-    false_values = {'false', '0', 'no', 'off'}
     normalized = value.lower()
 
-    if normalized in true_values:
+    if normalized in _TRUE_VALUES:
         return True
-    if normalized in false_values:
+    if normalized in _FALSE_VALUES:
         return False
 
     print(f"Error: Invalid boolean value for PERFECT. Found: '{value}'")
@@ -134,15 +136,14 @@ def _parse_coord(
     Parses "x,y" string into a tuple and checks bounds/border rules.
     """
     try:
-        if ',' not in value:
+        left, sep, right = value.partition(',')
+        if not sep:
             raise ValueError("Missing comma")
 
-        parts = value.split(',')
-        if len(parts) != 2:
-            raise ValueError("Too many/few values")
-
-        x = int(parts[0].strip())
-        y = int(parts[1].strip())
+        # int() already ignores surrounding whitespace, and rejects a
+        # second comma left over in 'right'
+        x = int(left)
+        y = int(right)
 
     except ValueError:
         print(f"Error: {name} must be in format 'x,y'. Found: '{value}'")
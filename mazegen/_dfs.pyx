@@ -0,0 +1,97 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Ahead-of-time build of the recursive backtracker in _kernels.py.
+
+Same arguments, history layout and xorshift64 stream as the Numba
+kernel, so a seed carves the same maze; only the JIT warm-up is gone.
+Build it in place with `make cython`; MazeGenerator picks it up
+automatically and otherwise falls back to Numba or pure Python.
+"""
+from libc.stdint cimport uint64_t
+
+ctypedef fused coord_t:
+    short
+    int
+
+# Indexed by a direction bit (1, 2, 4, 8); gives the neighbour's wall
+cdef unsigned char OPPOSITE[9]
+OPPOSITE[:] = [0, 4, 8, 0, 1, 0, 0, 0, 2]
+
+
+cpdef int dfs_generate(unsigned char[:, ::1] grid, int[:, ::1] stack,
+                       uint64_t state, coord_t[:, ::1] history_out):
+    """
+    Recursive backtracker over a uint8 wall grid.
+
+    Value 16 (bit 4) of a cell is its visited flag; stack[0] must hold the
+    (x, y) start cell, already flagged. 'state' comes from
+    _kernels.xorshift_state. Every removed wall is written to history_out
+    as a row (x1, y1, g1, x2, y2, g2), walls only.
+    Returns the number of rows written.
+    """
+    cdef int height = grid.shape[0]
+    cdef int width = grid.shape[1]
+    cdef int nbr_x[4]
+    cdef int nbr_y[4]
+    cdef unsigned char nbr_dir[4]
+    cdef int depth = 1
+    cdef int n_history = 0
+    cdef int cx, cy, nx, ny, count, i
+    cdef unsigned char direction
+
+    while depth > 0:
+        cx = stack[depth - 1, 0]
+        cy = stack[depth - 1, 1]
+
+        count = 0
+        if cy > 0 and grid[cy - 1, cx] & 16 == 0:
+            nbr_x[count] = cx
+            nbr_y[count] = cy - 1
+            nbr_dir[count] = 1  # NORTH
+            count += 1
+        if cy < height - 1 and grid[cy + 1, cx] & 16 == 0:
+            nbr_x[count] = cx
+            nbr_y[count] = cy + 1
+            nbr_dir[count] = 4  # SOUTH
+            count += 1
+        if cx < width - 1 and grid[cy, cx + 1] & 16 == 0:
+            nbr_x[count] = cx + 1
+            nbr_y[count] = cy
+            nbr_dir[count] = 2  # EAST
+            count += 1
+        if cx > 0 and grid[cy, cx - 1] & 16 == 0:
+            nbr_x[count] = cx - 1
+            nbr_y[count] = cy
+            nbr_dir[count] = 8  # WEST
+            count += 1
+
+        if count == 0:
+            depth -= 1
+            continue
+
+        # Same step as _kernels.xorshift64
+        state ^= state << 13
+        state ^= state >> 7
+        state ^= state << 17
+        i = <int>((state >> 32) % <uint64_t>count)
+
+        nx = nbr_x[i]
+        ny = nbr_y[i]
+        direction = nbr_dir[i]
+        grid[cy, cx] &= 255 ^ direction
+        grid[ny, nx] &= 255 ^ OPPOSITE[direction]
+
+        history_out[n_history, 0] = cx
+        history_out[n_history, 1] = cy
+        history_out[n_history, 2] = grid[cy, cx] & 15
+        history_out[n_history, 3] = nx
+        history_out[n_history, 4] = ny
+        history_out[n_history, 5] = grid[ny, nx] & 15
+        n_history += 1
+
+        grid[ny, nx] |= 16
+        stack[depth, 0] = nx
+        stack[depth, 1] = ny
+        depth += 1
+
+    return n_history
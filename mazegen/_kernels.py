@@ -0,0 +1,224 @@
+"""
+Compiled hot loops for MazeGenerator.
+
+Numba is optional: when it is missing, HAVE_NUMBA is False and the
+generator falls back to its pure-Python backtracker. Kernels without a
+Python twin (kruskal_carve) then simply run uncompiled.
+
+Numba itself is only imported when a kernel is first called, so a run
+that never needs it (the Cython backtracker below) does not pay for
+importing it.
+
+If the Cython build of the backtracker (_dfs.pyx, `make cython`) is
+present it is exported as cython_dfs_generate and preferred, since it
+needs no JIT warm-up.
+
+Every backtracker draws from the same xorshift64 stream (see
+xorshift64), so a seed carves the same maze whichever backend runs.
+"""
+import functools
+import importlib.util
+
+import numpy as np
+
+try:
+    from ._dfs import dfs_generate as cython_dfs_generate
+except ImportError:  # pragma: no cover - only after `make cython`
+    cython_dfs_generate = None
+
+# Found without importing it
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+# Kernel name -> plain Python function, and the callables that replace
+# them once _compile_kernels has run
+_KERNELS = {}
+_compiled = None
+
+
+def njit(**options):
+    """
+    Registers a kernel for Numba's njit(**options). Calling it compiles
+    every kernel of this module first, or runs it as plain Python when
+    Numba is missing.
+    """
+    def register(func):
+        _KERNELS[func.__name__] = (func, options)
+
+        @functools.wraps(func)
+        def kernel(*args):
+            return _compile_kernels()[func.__name__](*args)
+
+        kernel.py_func = func
+        return kernel
+    return register
+
+
+def _compile_kernels() -> dict:
+    global _compiled
+    if _compiled is None:
+        try:
+            from numba import njit as numba_njit
+        except ImportError:  # pragma: no cover - depends on the environment
+            compiled = {name: func for name, (func, _) in _KERNELS.items()}
+        else:
+            compiled = {name: numba_njit(**options)(func)
+                        for name, (func, options) in _KERNELS.items()}
+        # Kernels calling each other must find the compiled versions
+        globals().update(compiled)
+        _compiled = compiled
+    return _compiled
+
+
+# Indexed by a direction bit (1, 2, 4, 8); gives the neighbour's wall
+OPPOSITE = np.array([0, 4, 8, 0, 1, 0, 0, 0, 2], dtype=np.uint8)
+
+# Mixed into the 64-bit seed to get the first xorshift64 state
+XORSHIFT_SEED_MIX = 0x9E3779B97F4A7C15
+
+
+def xorshift_state(seed: int) -> int:
+    """First xorshift64 state for a 64-bit seed; never zero."""
+    return (seed ^ XORSHIFT_SEED_MIX) or 1
+
+
+@njit(cache=True)
+def xorshift64(state):
+    """
+    One xorshift64 step on a np.uint64 state.
+
+    The backtrackers pick neighbour (state >> 32) % count after each
+    step. _dfs.pyx and MazeGenerator._backtrack_python inline the same
+    step; keep all three in sync.
+    """
+    state ^= state << np.uint64(13)
+    state ^= state >> np.uint64(7)
+    state ^= state << np.uint64(17)
+    return state
+
+
+@njit(cache=True)
+def dfs_generate(grid, stack, state, history_out):
+    """
+    Recursive backtracker over a uint8 wall grid.
+
+    Value 16 (bit 4) of a cell is its visited flag; stack[0] must hold the
+    (x, y) start cell, already flagged. 'state' is the np.uint64 from
+    xorshift_state. Every removed wall is written to history_out as a row
+    (x1, y1, g1, x2, y2, g2), walls only.
+    Returns the number of rows written.
+    """
+    height, width = grid.shape
+
+    nbr_x = np.empty(4, np.int32)
+    nbr_y = np.empty(4, np.int32)
+    nbr_dir = np.empty(4, np.uint8)
+
+    depth = 1
+    n_history = 0
+    while depth > 0:
+        cx = stack[depth - 1, 0]
+        cy = stack[depth - 1, 1]
+
+        count = 0
+        if cy > 0 and grid[cy - 1, cx] & 16 == 0:
+            nbr_x[count] = cx
+            nbr_y[count] = cy - 1
+            nbr_dir[count] = 1  # NORTH
+            count += 1
+        if cy < height - 1 and grid[cy + 1, cx] & 16 == 0:
+            nbr_x[count] = cx
+            nbr_y[count] = cy + 1
+            nbr_dir[count] = 4  # SOUTH
+            count += 1
+        if cx < width - 1 and grid[cy, cx + 1] & 16 == 0:
+            nbr_x[count] = cx + 1
+            nbr_y[count] = cy
+            nbr_dir[count] = 2  # EAST
+            count += 1
+        if cx > 0 and grid[cy, cx - 1] & 16 == 0:
+            nbr_x[count] = cx - 1
+            nbr_y[count] = cy
+            nbr_dir[count] = 8  # WEST
+            count += 1
+
+        if count == 0:
+            depth -= 1
+            continue
+
+        state = xorshift64(state)
+        i = int((state >> np.uint64(32)) % np.uint64(count))
+        nx = nbr_x[i]
+        ny = nbr_y[i]
+        direction = nbr_dir[i]
+        grid[cy, cx] &= 255 ^ direction
+        grid[ny, nx] &= 255 ^ OPPOSITE[direction]
+
+        history_out[n_history, 0] = cx
+        history_out[n_history, 1] = cy
+        history_out[n_history, 2] = grid[cy, cx] & 15
+        history_out[n_history, 3] = nx
+        history_out[n_history, 4] = ny
+        history_out[n_history, 5] = grid[ny, nx] & 15
+        n_history += 1
+
+        grid[ny, nx] |= 16
+        stack[depth, 0] = nx
+        stack[depth, 1] = ny
+        depth += 1
+
+    return n_history
+
+
+@njit(cache=True)
+def _find_root(parents, i):
+    """Union-find lookup with path compression."""
+    root = i
+    while parents[root] != root:
+        root = parents[root]
+    while parents[i] != root:
+        parent = parents[i]
+        parents[i] = root
+        i = parent
+    return root
+
+
+@njit(cache=True)
+def kruskal_carve(grid, edges, parents, history_out):
+    """
+    Kruskal's algorithm over a pre-shuffled edge list.
+
+    Each edge row is (x1, y1, x2, y2) with the second cell either east
+    or south of the first. 'parents' is the flat union-find forest,
+    initialised to arange(width * height). Returns the number of
+    history rows written, in the same layout as dfs_generate.
+    """
+    width = grid.shape[1]
+    n_history = 0
+    for k in range(edges.shape[0]):
+        x1 = edges[k, 0]
+        y1 = edges[k, 1]
+        x2 = edges[k, 2]
+        y2 = edges[k, 3]
+
+        root1 = _find_root(parents, y1 * width + x1)
+        root2 = _find_root(parents, y2 * width + x2)
+        if root1 == root2:
+            continue
+        parents[root2] = root1
+
+        if x2 == x1 + 1:
+            grid[y1, x1] &= 255 ^ 2  # EAST
+            grid[y2, x2] &= 255 ^ 8  # WEST
+        else:
+            grid[y1, x1] &= 255 ^ 4  # SOUTH
+            grid[y2, x2] &= 255 ^ 1  # NORTH
+
+        history_out[n_history, 0] = x1
+        history_out[n_history, 1] = y1
+        history_out[n_history, 2] = grid[y1, x1] & 15
+        history_out[n_history, 3] = x2
+        history_out[n_history, 4] = y2
+        history_out[n_history, 5] = grid[y2, x2] & 15
+        n_history += 1
+
+    return n_history
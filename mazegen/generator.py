@@ -1,5 +1,30 @@
 import random
-from typing import List, Tuple, Optional
+from array import array
+from typing import FrozenSet, List, Tuple, Optional
+
+import numpy as np
+
+from ._kernels import (
+    HAVE_NUMBA, cython_dfs_generate, dfs_generate, kruskal_carve,
+    xorshift_state)
+
+# '42' pattern pixels as (dx, dy) offsets, 3x5 per digit; the '2' is
+# shifted by 4 (3 width + 1 gap)
+_PAT_42 = np.array([
+    # '4'
+    [0, 0], [2, 0],
+    [0, 1], [2, 1],
+    [0, 2], [1, 2], [2, 2],
+    [2, 3],
+    [2, 4],
+    # '2'
+    [4, 0], [5, 0], [6, 0],
+    [6, 1],
+    [4, 2], [5, 2], [6, 2],
+    [4, 3],
+    [4, 4], [5, 4], [6, 4],
+], dtype=np.int32)
+_PAT_42.flags.writeable = False
 
 
 class MazeGenerator:
@@ -12,6 +37,12 @@ class MazeGenerator:
     SOUTH: int = 4
     WEST: int = 8
     ALL_WALLS: int = 15
+    # Direction -> the matching wall on the neighbouring cell
+    OPPOSITE = {NORTH: SOUTH, SOUTH: NORTH, EAST: WEST, WEST: EAST}
+    # Bit 4 marks a cell as visited while carving; stripped afterwards
+    VISITED: int = 16
+
+    ALGORITHMS = ("backtracker", "kruskal")
 
     def __init__(
             self,
@@ -26,49 +57,62 @@ class MazeGenerator:
         self.height = height
         self._rng = random.Random(seed)
 
-        # Initialize grid with 15
-        self.grid: List[List[int]] = [
-            [self.ALL_WALLS for _ in range(width)] for _ in range(height)
-        ]
-        # history list for the animation logic in visuals/tui.py
-        self.history = []
-        # set for the 42 pattern coords
-        self.pattern_42_coords = set()
+        # Initialize grid with 15 (one uint8 per cell, indexed [y, x])
+        self.grid: np.ndarray = np.full(
+            (height, width), self.ALL_WALLS, dtype=np.uint8)
+        # History for the animation logic in visuals/tui.py: one row
+        # (x1, y1, g1, x2, y2, g2) per removed wall, written at a cursor.
+        # A perfect maze removes at most w*h - 1 walls; the buffer only
+        # grows if the imperfect pass needs more room.
+        coord_type = np.int16 if max(width, height) <= 32767 else np.int32
+        self._history_buf = np.empty((width * height, 6), dtype=coord_type)
+        self._history_len = 0
+        self._history_list: Optional[list] = None
+        # (x, y) coords of the 42 pattern, fixed once embedded
+        self.pattern_42_coords: FrozenSet[Tuple[int, int]] = frozenset()
+        # same cells as a [y, x] boolean mask for cheap membership tests
+        self.pattern_mask: np.ndarray = np.zeros((height, width), dtype=bool)
         self.pattern_42_failed = False
 
-    def generate(self, perfect: bool = True) -> None:  # <--- Updated Signature
+    def generate(
+            self,
+            perfect: bool = True,
+            algorithm: str = "backtracker") -> None:
         """
         Executes the generation algorithm.
+        'algorithm' is one of ALGORITHMS. Kruskal gives a differently
+        textured maze but is several times slower than the backtracker
+        and needs a shuffled list of every edge in memory.
         """
-        # 1. Reset Grid
-        self.grid = [[15 for _ in range(self.width)]
-                     for _ in range(self.height)]
-        self.history = []
-        self.pattern_42_coords = set()
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}'. "
+                             f"Expected one of {self.ALGORITHMS}.")
+
+        # 1. Reset Grid (in place, single C-level fill)
+        self.grid.fill(self.ALL_WALLS)
+        self._history_len = 0
+        self._history_list = None
+        self.pattern_42_coords = frozenset()
+        self.pattern_mask.fill(False)
         self.pattern_42_failed = False
 
-        start_x, start_y = 0, 0
-        stack = [(start_x, start_y)]
-        visited = set()
-        visited.add((start_x, start_y))
-
         # Embed the '42' pattern
-        self._embed_42(visited)
-
-        # 2. Generate Perfect Maze (Recursive Backtracker)
-        while stack:
-            # ... (Existing loop code remains exactly the same) ...
-            current_x, current_y = stack[-1]
-            unvisited_neighbors = self._get_unvisited_neighbors(
-                current_x, current_y, visited)
-
-            if unvisited_neighbors:
-                nx, ny, direction = self._rng.choice(unvisited_neighbors)
-                self._remove_wall(current_x, current_y, nx, ny, direction)
-                visited.add((nx, ny))
-                stack.append((nx, ny))
+        self._embed_42()
+
+        # 2. Generate Perfect Maze
+        if algorithm == "kruskal":
+            self._kruskal()
+        else:
+            start = (0, 0)
+            self.grid[start[1], start[0]] |= self.VISITED
+
+            if cython_dfs_generate is not None or HAVE_NUMBA:
+                self._backtrack_compiled(start)
             else:
-                stack.pop()
+                self._backtrack_python(start)
+
+        # Drop the visited flags, leaving only the wall bits
+        self.grid &= self.ALL_WALLS
 
         if not perfect:
             self.make_imperfect()
@@ -83,54 +127,187 @@ class MazeGenerator:
         if entry == exit:
             raise ValueError("Entry and Exit cannot be the same coordinate.")
 
-    def get_grid(self) -> List[List[int]]:
+    def generate_kruskal(self, perfect: bool = True) -> None:
+        """
+        Shortcut for generate(perfect, algorithm="kruskal").
+        """
+        self.generate(perfect=perfect, algorithm="kruskal")
+
+    def get_grid(self) -> np.ndarray:
         return self.grid
 
+    @property
+    def history_array(self) -> np.ndarray:
+        """
+        Recorded wall removals as rows of (x1, y1, g1, x2, y2, g2).
+        """
+        return self._history_buf[:self._history_len]
+
+    @property
+    def history(self) -> List[List[Tuple[int, int, int]]]:
+        """
+        History as [(x1, y1, g1), (x2, y2, g2)] pairs, built on first
+        access after each generation and memoized.
+        """
+        if self._history_list is None:
+            self._history_list = [
+                [(x1, y1, g1), (x2, y2, g2)]
+                for x1, y1, g1, x2, y2, g2 in self.history_array.tolist()
+            ]
+        return self._history_list
+
     # --- Internal Helper Methods ---
 
-    def _get_unvisited_neighbors(
-            self,
-            x: int,
-            y: int,
-            visited: set) -> List[Tuple[int, int, int]]:
-        neighbors = []
-        if y > 0 and (x, y - 1) not in visited:
-            neighbors.append((x, y - 1, self.NORTH))
-        if y < self.height - 1 and (x, y + 1) not in visited:
-            neighbors.append((x, y + 1, self.SOUTH))
-        if x < self.width - 1 and (x + 1, y) not in visited:
-            neighbors.append((x + 1, y, self.EAST))
-        if x > 0 and (x - 1, y) not in visited:
-            neighbors.append((x - 1, y, self.WEST))
-        return neighbors
-
-    def _remove_wall(
-            self,
-            x1: int,
-            y1: int,
-            x2: int,
-            y2: int,
-            direction: int,
-            record_history: bool = True) -> None:
-        self.grid[y1][x1] &= ~direction
-
-        opposite_direction = 0
-        if direction == self.NORTH:
-            opposite_direction = self.SOUTH
-        elif direction == self.SOUTH:
-            opposite_direction = self.NORTH
-        elif direction == self.EAST:
-            opposite_direction = self.WEST
-        elif direction == self.WEST:
-            opposite_direction = self.EAST
-
-        self.grid[y2][x2] &= ~opposite_direction
-
-        if record_history:
-            self.history.append([
-                (x1, y1, self.grid[y1][x1]),
-                (x2, y2, self.grid[y2][x2])
-            ])
+    def _backtrack_python(self, start: Tuple[int, int]) -> None:
+        """
+        Pure-Python backtracker, used when Numba is unavailable.
+        It carves a flat bytearray copy of the grid (cell (x, y) lives at
+        y * width + x): bytearray items are plain ints, far cheaper to
+        read and write than NumPy scalars. The result is copied back in
+        one go at the end.
+        """
+        # Hot loop: everything it touches is bound to a local up front,
+        # and the neighbour scan is inlined to skip a method call per step
+        w = self.width
+        size = w * self.height
+        cells = bytearray(self.grid.tobytes())
+        history = array('i')
+        history_extend = history.extend
+        # Same xorshift64 stream as the compiled kernels (see
+        # _kernels.xorshift64), on plain ints masked to 64 bits
+        state = xorshift_state(self._rng.getrandbits(64))
+        MASK64 = 0xFFFFFFFFFFFFFFFF
+        max_x = w - 1
+        N, E, S, W = self.NORTH, self.EAST, self.SOUTH, self.WEST
+        OPPOSITE = self.OPPOSITE
+        VISITED = self.VISITED
+
+        start_x, start_y = start
+        flat_stack = [start_y * w + start_x]
+        stack_append = flat_stack.append
+        stack_pop = flat_stack.pop
+
+        # Candidate neighbours, reused every step: (nbr_idx, nbr_dir)
+        nbr_idx = [0] * 4
+        nbr_dir = [0] * 4
+
+        while flat_stack:
+            i = flat_stack[-1]
+            cy, cx = divmod(i, w)
+
+            count = 0
+            if i >= w and not cells[i - w] & VISITED:
+                nbr_idx[count] = i - w
+                nbr_dir[count] = N
+                count += 1
+            if i + w < size and not cells[i + w] & VISITED:
+                nbr_idx[count] = i + w
+                nbr_dir[count] = S
+                count += 1
+            if cx < max_x and not cells[i + 1] & VISITED:
+                nbr_idx[count] = i + 1
+                nbr_dir[count] = E
+                count += 1
+            if cx > 0 and not cells[i - 1] & VISITED:
+                nbr_idx[count] = i - 1
+                nbr_dir[count] = W
+                count += 1
+
+            if not count:
+                stack_pop()
+                continue
+
+            state ^= (state << 13) & MASK64
+            state ^= state >> 7
+            state ^= (state << 17) & MASK64
+            k = (state >> 32) % count
+            j = nbr_idx[k]
+            direction = nbr_dir[k]
+            # Each cell byte is loaded and stored once; XOR against 0xFF
+            # keeps the VISITED bit alone
+            cell = cells[i] & (0xFF ^ direction)
+            neighbour = cells[j] & (0xFF ^ OPPOSITE[direction])
+            cells[i] = cell
+            cells[j] = neighbour | VISITED
+
+            ny, nx = divmod(j, w)
+            history_extend((cx, cy, cell & 15, nx, ny, neighbour & 15))
+            stack_append(j)
+
+        self.grid[:] = np.frombuffer(cells, dtype=np.uint8).reshape(
+            self.grid.shape)
+        self._append_history(
+            np.frombuffer(history, dtype=np.int32).reshape(-1, 6))
+
+    def _backtrack_compiled(self, start: Tuple[int, int]) -> None:
+        """
+        Runs the same backtracker through a compiled kernel: the Cython
+        build if present, the Numba one otherwise.
+        The xorshift64 state is seeded from self._rng exactly as in
+        _backtrack_python, so a seed gives the same maze on every backend.
+        """
+        kernel = cython_dfs_generate or dfs_generate
+        dfs_stack = np.empty((self.width * self.height, 2), dtype=np.int32)
+        dfs_stack[0] = start
+
+        # The kernel writes straight into the free tail of the buffer
+        state = np.uint64(xorshift_state(self._rng.getrandbits(64)))
+        count = kernel(self.grid, dfs_stack, state,
+                       self._history_buf[self._history_len:])
+        self._history_len += count
+
+    def _kruskal(self) -> None:
+        """
+        Kruskal's algorithm with a flat union-find over every cell.
+        Edges touching the '42' pattern are skipped.
+        """
+        w, h = self.width, self.height
+        free = ~self.pattern_mask
+
+        # East edges (x, y)-(x + 1, y), then south edges (x, y)-(x, y + 1),
+        # written straight into one int32 (n_edges, 4) array
+        east_free = free[:, :-1] & free[:, 1:]
+        south_free = free[:-1, :] & free[1:, :]
+        n_east = int(np.count_nonzero(east_free))
+        edges = np.empty(
+            (n_east + int(np.count_nonzero(south_free)), 4), dtype=np.int32)
+        east, south = edges[:n_east], edges[n_east:]
+        east[:, 1], east[:, 0] = np.nonzero(east_free)
+        east[:, 2] = east[:, 0] + 1
+        east[:, 3] = east[:, 1]
+        south[:, 1], south[:, 0] = np.nonzero(south_free)
+        south[:, 2] = south[:, 0]
+        south[:, 3] = south[:, 1] + 1
+
+        # Gathering through a permutation is far faster than shuffling
+        # the 2D array row by row in place
+        edges = edges[self._numpy_rng().permutation(len(edges))]
+
+        parents = np.arange(w * h, dtype=np.int32)
+        count = kruskal_carve(self.grid, edges, parents,
+                              self._history_buf[self._history_len:])
+        self._history_len += count
+
+    def _numpy_rng(self) -> np.random.Generator:
+        """
+        A NumPy generator seeded from self._rng, so seeded mazes stay
+        reproducible across the vectorised code paths.
+        """
+        return np.random.default_rng(self._rng.getrandbits(64))
+
+    def _append_history(self, rows: np.ndarray) -> None:
+        """
+        Appends (x1, y1, g1, x2, y2, g2) rows, growing the buffer if the
+        imperfect pass needs more room than a perfect maze.
+        """
+        start = self._history_len
+        end = start + len(rows)
+        if end > len(self._history_buf):
+            self._history_buf = np.resize(
+                self._history_buf, (max(end, 2 * len(self._history_buf)), 6))
+        self._history_buf[start:end] = rows
+        self._history_len = end
+        self._history_list = None
 
     def _validate_border_point(
             self,
@@ -144,28 +321,12 @@ class MazeGenerator:
         if not is_on_border:
             raise ValueError(f"{name} {point} must be on the maze border.")
 
-    def _embed_42(self, visited: set) -> None:
+    def _embed_42(self) -> None:
         """
         Embeds a COMPACT '42' pattern (3x5 pixels).
         This is the smallest size that keeps the '2' legible.
         Total Size: 7 wide x 5 high.
         """
-        pat_4 = {
-            (0, 0), (2, 0),
-            (0, 1), (2, 1),
-            (0, 2), (1, 2), (2, 2),
-            (2, 3),
-            (2, 4)
-        }
-
-        pat_2 = {
-            (0, 0), (1, 0), (2, 0),
-            (2, 1),
-            (0, 2), (1, 2), (2, 2),
-            (0, 3),
-            (0, 4), (1, 4), (2, 4)
-        }
-
         # Dimensions
         pat_width = 7  # 3 (digit) + 1 (gap) + 3 (digit)
         pat_height = 5
@@ -180,74 +341,63 @@ class MazeGenerator:
         offset_x = (self.width - pat_width) // 2
         offset_y = (self.height - pat_height) // 2
 
-        # Apply '4'
-        for (dx, dy) in pat_4:
-            px, py = offset_x + dx, offset_y + dy
-            visited.add((px, py))
-            self.pattern_42_coords.add((px, py))
-
-        # Apply '2' (Shifted by 4 spaces: 3 width + 1 gap)
-        for (dx, dy) in pat_2:
-            px, py = offset_x + dx + 4, offset_y + dy
-            visited.add((px, py))
-            self.pattern_42_coords.add((px, py))
+        # Apply '4' and '2' in one shot
+        xs = offset_x + _PAT_42[:, 0]
+        ys = offset_y + _PAT_42[:, 1]
+        self.grid[ys, xs] |= self.VISITED
+        self.pattern_mask[ys, xs] = True
+        self.pattern_42_coords = frozenset(zip(xs.tolist(), ys.tolist()))
 
     def make_imperfect(self) -> None:
         """
         Randomly breaks a few internal walls to create loops.
-        Does NOT scan the whole grid.
+        All closed walls clear of the '42' pattern are gathered at once
+        and the ones to break are sampled in a single call.
         """
+        grid = self.grid
+        w = self.width
+        free = ~self.pattern_mask
         walls_to_break = max(
             1, int((self.width * self.height) * 0.03))
-        count = 0
-        max_attempts = 500  # Safety break to prevent infinite loops
-        attempts = 0
-
-        while count < walls_to_break and attempts < max_attempts:
-            attempts += 1
-
-            # 1. Pick a RANDOM spot (No looping through grid!)
-            x = self._rng.randint(0, self.width - 1)
-            y = self._rng.randint(0, self.height - 1)
 
-            # Don't touch the '42' pattern
-            if (x, y) in self.pattern_42_coords:
-                continue
-
-            # 2. Identify neighbors we *could* connect to
-            valid_walls = []
-
-            # Check North (If there is a wall, we can break it)
-            if y > 0 and (self.grid[y][x] & self.NORTH):
-                valid_walls.append((x, y - 1, self.NORTH))
-
-            # Check South
-            if y < self.height - 1 and (self.grid[y][x] & self.SOUTH):
-                valid_walls.append((x, y + 1, self.SOUTH))
-
-            # Check East
-            if x < self.width - 1 and (self.grid[y][x] & self.EAST):
-                valid_walls.append((x + 1, y, self.EAST))
-
-            # Check West
-            if x > 0 and (self.grid[y][x] & self.WEST):
-                valid_walls.append((x - 1, y, self.WEST))
-
-            if not valid_walls:
-                continue
-
-            # 3. Pick one random wall to attempt breaking
-            nx, ny, direction = self._rng.choice(valid_walls)
-
-            # Don't break into '42'
-            if (nx, ny) in self.pattern_42_coords:
-                continue
+        # 1. Candidate walls: closed south sides (x, y)-(x, y + 1) and
+        #    closed east sides (x, y)-(x + 1, y), both ends outside '42'
+        south = (grid[:-1, :] & self.SOUTH).astype(bool)
+        south &= free[:-1, :] & free[1:, :]
+        east = (grid[:, :-1] & self.EAST).astype(bool)
+        east &= free[:, :-1] & free[:, 1:]
+        sy, sx = np.nonzero(south)
+        ey, ex = np.nonzero(east)
+        edges = np.concatenate((
+            np.stack((sx, sy, sx, sy + 1), axis=1),
+            np.stack((ex, ey, ex + 1, ey), axis=1)))
+        if not len(edges):
+            return
 
-            # 4. Check the 3x3 Rule
-            # We temporarily break it, check safety, and revert if bad.
-            self._remove_wall(x, y, nx, ny, direction, record_history=False)
-            self.history.append([
-                (x, y, self.grid[y][x]),
-                (nx, ny, self.grid[ny][nx])
-            ])
-            count += 1
+        # 2. Pick the walls to break, in random order
+        k = min(walls_to_break, len(edges))
+        picks = self._numpy_rng().choice(len(edges), size=k, replace=False)
+        x1, y1, x2, y2 = edges[picks].T
+        is_south = y2 > y1
+        wall1 = np.where(is_south, self.SOUTH, self.EAST).astype(np.uint8)
+        wall2 = np.where(is_south, self.NORTH, self.WEST).astype(np.uint8)
+
+        # 3. Value of each touched cell right after its own step, so the
+        #    history replays exactly. Events are sorted by (cell, step);
+        #    a cell has at most 4 walls, so OR-ing in up to 3 earlier
+        #    events of the same cell gives the walls removed so far.
+        cells = np.concatenate((y1 * w + x1, y2 * w + x2))
+        walls = np.concatenate((wall1, wall2))
+        order = np.lexsort((np.tile(np.arange(k), 2), cells))
+        sorted_cells = cells[order]
+        removed = walls[order]
+        for lag in range(1, 4):
+            same = sorted_cells[lag:] == sorted_cells[:-lag]
+            removed[lag:] |= np.where(same, walls[order][:-lag], 0)
+        after = np.empty_like(walls)
+        after[order] = grid.ravel()[sorted_cells] & (0xFF ^ removed)
+
+        # 4. Break them all and log them in bulk
+        np.bitwise_and.at(grid.ravel(), cells, 0xFF ^ walls)
+        self._append_history(
+            np.stack((x1, y1, after[:k], x2, y2, after[k:]), axis=1))
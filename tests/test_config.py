@@ -0,0 +1,47 @@
+import pytest
+
+from config.loader import _parse_bool, _parse_coord
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("0,0", (0, 0)),
+    ("9,4", (9, 4)),
+    (" 3 , 0 ", (3, 0)),
+    ("0,2", (0, 2)),
+])
+def test_parse_coord_accepts_border_points(value, expected):
+    assert _parse_coord(value, "ENTRY", 10, 5) == expected
+
+
+@pytest.mark.parametrize("value, message", [
+    ("1,2,3", "must be in format 'x,y'"),
+    ("12", "must be in format 'x,y'"),
+    ("a,b", "must be in format 'x,y'"),
+    ("", "must be in format 'x,y'"),
+    ("1,", "must be in format 'x,y'"),
+    ("10,0", "out of maze bounds"),
+    ("-1,0", "out of maze bounds"),
+    ("3,2", "must be on the maze border"),
+])
+def test_parse_coord_rejects(value, message, capsys):
+    with pytest.raises(SystemExit) as exc:
+        _parse_coord(value, "ENTRY", 10, 5)
+    assert exc.value.code == 1
+    assert message in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("true", True), ("True", True), ("1", True), ("YES", True), ("on", True),
+    ("false", False), ("FALSE", False), ("0", False), ("no", False),
+    ("Off", False),
+])
+def test_parse_bool_accepts(value, expected):
+    assert _parse_bool(value) is expected
+
+
+@pytest.mark.parametrize("value", ["", "maybe", "2", "truee", " true"])
+def test_parse_bool_rejects(value, capsys):
+    with pytest.raises(SystemExit) as exc:
+        _parse_bool(value)
+    assert exc.value.code == 1
+    assert "Invalid boolean value" in capsys.readouterr().out
@@ -0,0 +1,158 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from mazegen import _kernels, generator
+from mazegen.generator import MazeGenerator
+
+N, E, S, W = 1, 2, 4, 8
+
+# Backtracker backends, skipped when not available here
+BACKENDS = [
+    "python",
+    pytest.param("numba", marks=pytest.mark.skipif(
+        not _kernels.HAVE_NUMBA, reason="numba not installed")),
+    pytest.param("cython", marks=pytest.mark.skipif(
+        _kernels.cython_dfs_generate is None,
+        reason="run `make cython` first")),
+]
+
+
+def use_backend(monkeypatch, backend):
+    """Points MazeGenerator's dispatch at a single backtracker backend."""
+    if backend == "cython":
+        return
+    monkeypatch.setattr(generator, "cython_dfs_generate", None)
+    monkeypatch.setattr(generator, "HAVE_NUMBA", backend == "numba")
+    if backend == "python":
+        monkeypatch.setattr(generator, "kruskal_carve", uncompiled(
+            _kernels.kruskal_carve))
+
+
+def uncompiled(kernel):
+    return getattr(kernel, "py_func", kernel)
+
+
+def generate(width=25, height=15, seed=42, **kwargs):
+    maze = MazeGenerator(width, height, seed=seed)
+    maze.generate(**kwargs)
+    return maze
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_seed_gives_same_maze_on_every_backend(monkeypatch, backend):
+    # The pure-Python backtracker is the reference
+    use_backend(monkeypatch, "python")
+    reference = generate()
+
+    monkeypatch.undo()
+    use_backend(monkeypatch, backend)
+    maze = generate()
+
+    np.testing.assert_array_equal(maze.grid, reference.grid)
+    np.testing.assert_array_equal(
+        maze.history_array, reference.history_array)
+
+
+def test_uncompiled_kernel_matches_python(monkeypatch):
+    use_backend(monkeypatch, "python")
+    reference = generate()
+
+    # The kernel as it runs when numba is missing: plain Python throughout
+    monkeypatch.setattr(_kernels, "xorshift64", uncompiled(
+        _kernels.xorshift64))
+    monkeypatch.setattr(generator, "HAVE_NUMBA", True)
+    monkeypatch.setattr(generator, "dfs_generate", uncompiled(
+        _kernels.dfs_generate))
+    maze = generate()
+
+    np.testing.assert_array_equal(maze.grid, reference.grid)
+    np.testing.assert_array_equal(
+        maze.history_array, reference.history_array)
+
+
+# --- Maze invariants, over every algorithm / perfection / backend ---
+
+@pytest.fixture(params=[
+    (algorithm, perfect, backend)
+    for algorithm in MazeGenerator.ALGORITHMS
+    for perfect in (True, False)
+    for backend in ("python", "numba")
+], ids=lambda p: "-".join(map(str, p)))
+def generated(request, monkeypatch):
+    """(maze, perfect) for one algorithm / perfection / backend."""
+    algorithm, perfect, backend = request.param
+    if backend == "numba" and not _kernels.HAVE_NUMBA:
+        pytest.skip("numba not installed")
+    use_backend(monkeypatch, backend)
+    maze = generate(31, 21, seed=7, perfect=perfect, algorithm=algorithm)
+    return maze, perfect
+
+
+def open_passages(grid, free):
+    """Open east and south walls between two free cells."""
+    east = (grid[:, :-1] & E == 0) & free[:, :-1] & free[:, 1:]
+    south = (grid[:-1, :] & S == 0) & free[:-1, :] & free[1:, :]
+    return int(np.count_nonzero(east) + np.count_nonzero(south))
+
+
+def reachable(grid, start):
+    seen = {start}
+    queue = deque([start])
+    height, width = grid.shape
+    while queue:
+        x, y = queue.popleft()
+        for wall, dx, dy in ((N, 0, -1), (E, 1, 0), (S, 0, 1), (W, -1, 0)):
+            nxt = (x + dx, y + dy)
+            if not grid[y, x] & wall and nxt not in seen:
+                assert 0 <= nxt[0] < width and 0 <= nxt[1] < height
+                seen.add(nxt)
+                queue.append(nxt)
+    return seen
+
+
+def test_neighbours_agree_on_shared_walls(generated):
+    maze, _ = generated
+    grid = maze.grid
+    np.testing.assert_array_equal(
+        grid[:, :-1] & E != 0, grid[:, 1:] & W != 0)
+    np.testing.assert_array_equal(grid[:-1] & S != 0, grid[1:] & N != 0)
+
+
+def test_border_and_42_stay_closed(generated):
+    maze, _ = generated
+    grid = maze.grid
+    assert np.all(grid[0] & N) and np.all(grid[-1] & S)
+    assert np.all(grid[:, 0] & W) and np.all(grid[:, -1] & E)
+    assert maze.pattern_mask.any()
+    assert np.all(grid[maze.pattern_mask] == 15)
+
+
+def test_free_cells_are_connected(generated):
+    maze, perfect = generated
+    free = ~maze.pattern_mask
+    n_free = np.count_nonzero(free)
+    assert len(reachable(maze.grid, (0, 0))) == n_free
+
+    # A spanning tree has exactly n - 1 passages; loops add more
+    openings = open_passages(maze.grid, free)
+    if perfect:
+        assert openings == n_free - 1
+    else:
+        assert openings > n_free - 1
+
+
+def test_history_replays_to_grid(generated):
+    maze, _ = generated
+    replay = np.full_like(maze.grid, 15)
+    for x1, y1, g1, x2, y2, g2 in maze.history_array.tolist():
+        replay[y1, x1] = g1
+        replay[y2, x2] = g2
+    np.testing.assert_array_equal(replay, maze.grid)
+
+    # The list-of-pairs view carries the same steps
+    assert maze.history == [
+        [(x1, y1, g1), (x2, y2, g2)]
+        for x1, y1, g1, x2, y2, g2 in maze.history_array.tolist()
+    ]
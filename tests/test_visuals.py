@@ -0,0 +1,118 @@
+import io
+import re
+
+import numpy as np
+import pytest
+
+from mazegen.generator import MazeGenerator
+from visuals.ascii_renderer import ASCIIVisualizer
+
+# 3x3 maze, one path snaking (0,0) -> (2,0) -> (0,1) -> (2,2)
+GRID = np.array([
+    [13, 5, 3],
+    [9, 5, 6],
+    [12, 5, 7],
+], dtype=np.uint8)
+
+EXPECTED_ASCII = (
+    "+---+---+---+\n"
+    "|           |\n"
+    "+---+---+   +\n"
+    "|           |\n"
+    "+   +---+---+\n"
+    "|           |\n"
+    "+---+---+---+"
+)
+
+
+def test_render_matches_expected_ascii():
+    assert ASCIIVisualizer().render(GRID) == EXPECTED_ASCII
+
+
+def test_render_accepts_nested_lists():
+    assert ASCIIVisualizer().render(GRID.tolist()) == EXPECTED_ASCII
+
+
+def test_render_to_streams_the_same_text():
+    buffer = io.StringIO()
+    ASCIIVisualizer().render_to(GRID, buffer)
+    assert buffer.getvalue() == EXPECTED_ASCII
+
+
+# --- Thick renderer, driven by generated mazes ---
+
+@pytest.fixture(params=[
+    (algorithm, perfect)
+    for algorithm in MazeGenerator.ALGORITHMS
+    for perfect in (True, False)
+], ids=lambda p: "-".join(map(str, p)))
+def maze(request):
+    algorithm, perfect = request.param
+    maze = MazeGenerator(31, 21, seed=7)
+    maze.generate(perfect=perfect, algorithm=algorithm)
+    return maze
+
+
+def test_patch_thick_matches_full_render(maze):
+    visualizer = ASCIIVisualizer()
+    mask = maze.pattern_mask
+    height, width = maze.grid.shape
+    entry, exit = (0, 0), (width - 1, height - 1)
+
+    # Replays the history in batches, as the TUI animation does
+    display = np.full_like(maze.grid, 15)
+    canvas = visualizer.thick_canvas(display, mask, entry, exit)
+    history = maze.history_array
+    for start in range(0, len(history), 7):
+        cells = history[start:start + 7].reshape(-1, 3)
+        np.bitwise_and.at(display, (cells[:, 1], cells[:, 0]), cells[:, 2])
+        visualizer.patch_thick(
+            canvas, display, cells[:, 0], cells[:, 1], mask, entry, exit)
+        assert visualizer.canvas_text(canvas) == visualizer.render_thick(
+            display, mask, entry=entry, exit=exit)
+    np.testing.assert_array_equal(display, maze.grid)
+
+
+def test_thick_highlights_match_regex_scan(maze):
+    visualizer = ASCIIVisualizer()
+    height, width = maze.grid.shape
+    canvas = visualizer.thick_canvas(
+        maze.grid, maze.pattern_mask, (0, 0), (width - 1, height - 1))
+    text = visualizer.canvas_text(canvas)
+
+    # The three highlight scans the TUI used to run
+    expected = sorted(
+        (m.start(), m.end(), glyph)
+        for pattern, glyph in (("▒+", "▒"), ("●", "●"), ("◉", "◉"))
+        for m in re.finditer(pattern, text)
+    )
+    assert visualizer.thick_highlights(canvas) == expected
+
+
+# --- TUI output file ---
+
+def make_app(output_file):
+    tui = pytest.importorskip("visuals.tui")
+    maze = MazeGenerator(3, 3)
+    maze.grid[:] = GRID
+    return tui.MazeApp(maze, (0, 0), (2, 2), output_file=output_file)
+
+
+def test_save_maze_writes_the_ascii(tmp_path):
+    path = tmp_path / "maze.txt"
+    make_app(str(path))._save_maze()
+    assert path.read_text() == EXPECTED_ASCII
+
+
+def test_save_maze_without_output_file_writes_nothing(tmp_path):
+    make_app(None)._save_maze()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_maze_reports_write_errors(tmp_path, monkeypatch):
+    app = make_app(str(tmp_path / "missing" / "maze.txt"))
+    notes = []
+    monkeypatch.setattr(app, "notify", lambda message, **kw: notes.append(
+        (message, kw.get("severity"))))
+    app._save_maze()
+    assert len(notes) == 1 and notes[0][1] == "error"
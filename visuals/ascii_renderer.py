@@ -1,4 +1,30 @@
-from typing import List
+import io
+from typing import TextIO
+
+import numpy as np
+
+
+def _glyph_table(*segments: str) -> np.ndarray:
+    """
+    Equal-length strings -> 2D array of single characters, one row each.
+    """
+    width = len(segments[0])
+    return np.array(segments, dtype=f'U{width}').view('U1').reshape(
+        len(segments), width)
+
+
+def _thick_cell_table() -> np.ndarray:
+    """
+    Both 6-char halves of a thick cell, indexed [walls, half, char].
+    Index 16 is a '42' cell. A cell only draws its own NORTH and WEST
+    walls; the right edge and bottom closure are drawn separately.
+    """
+    halves = []
+    for walls in range(16):
+        halves.append('█' + ('█' if walls & 1 else ' ') * 5)
+        halves.append(('█' if walls & 8 else ' ') + ' ' * 5)
+    halves += ['▒' * 6] * 2
+    return _glyph_table(*halves).reshape(17, 2, 6)
 
 
 class ASCIIVisualizer:
@@ -6,151 +32,200 @@ class ASCIIVisualizer:
     Handles converting the bitmask grid into string representations.
     """
 
-    def render(self, grid: List[List[int]]) -> str:
+    # --- Lookup tables, indexed by a single wall bit (or 2 for '42') ---
+    # Every entry of a table has the same length, so a row of gathered
+    # segments can be viewed as one string without any Python loop.
+    ROOF_LUT = np.array([b'+   ', b'+---'], dtype='S4')
+    WEST_LUT = np.array([b'    ', b'|   '], dtype='S4')
+
+    # Whole thick cell, indexed by its 4 wall bits (16 for '42')
+    THICK_CELL_LUT = _thick_cell_table()
+    THICK_FLOOR_LUT = _glyph_table('█     ', '██████', '█▒▒▒▒▒')
+
+    BLOCK = '█'
+    SPACE = ' '
+    P42 = '▒'
+    # Centered markers for 5-space width
+    ENTRY_MARKER = '  ●  '
+    EXIT_MARKER = '  ◉  '
+
+    def render(self, grid: np.ndarray) -> str:
         """
         Parses the grid and RETURNS the standard ASCII representation string.
         """
-        NORTH, SOUTH, WEST = 1, 4, 8
-        height = len(grid)
-        width = len(grid[0]) if height > 0 else 0
+        buffer = io.StringIO()
+        self.render_to(grid, buffer)
+        return buffer.getvalue()
 
-        output_lines = []
+    def render_to(self, grid: np.ndarray, fileobj: TextIO) -> None:
+        """
+        Streams the standard ASCII representation into fileobj one row at
+        a time, so the full string is never built in memory.
+        """
+        NORTH, EAST, SOUTH, WEST = 1, 2, 4, 8
+        # Works for both the uint8 ndarray and plain nested lists
+        grid = np.asarray(grid, dtype=np.uint8)
+        height, width = grid.shape
+        write = fileobj.write
 
         for y in range(height):
-            line_roof = ""
-            line_body = ""
-
-            for x in range(width):
-                cell = grid[y][x]
-
-                # Roof
-                line_roof += "+"
-                line_roof += "---" if (cell & NORTH) else "   "
-
-                # Body
-                if cell & WEST:
-                    line_body += "|"
-                else:
-                    line_body += " "
-                line_body += "   "
-
+            row = grid[y]
+            roof = self.ROOF_LUT[row & NORTH].tobytes() + b'+'
+            body = self.WEST_LUT[(row & WEST) >> 3].tobytes()
             # Close the row on the right
-            line_roof += "+"
-            if grid[y][width - 1] & 2:  # Check East
-                line_body += "|"
-            else:
-                line_body += " "
-
-            output_lines.append(line_roof)
-            output_lines.append(line_body)
+            body += b'|' if row[-1] & EAST else b' '
+            write((roof + b'\n' + body + b'\n').decode('ascii'))
 
         # Bottom Closure
-        bottom_line = ""
-        for x in range(width):
-            bottom_line += "+"
-            bottom_line += "---" if (grid[height - 1][x] & SOUTH) else "   "
-        bottom_line += "+"
-        output_lines.append(bottom_line)
-        return "\n".join(output_lines)
+        floor = self.ROOF_LUT[(grid[-1] & SOUTH) >> 2].tobytes() + b'+'
+        write(floor.decode('ascii'))
 
     def render_thick(
         self,
-        grid: List[List[int]],
-        pattern_coords: set = None,
+        grid: np.ndarray,
+        pattern_mask: np.ndarray = None,
         entry: tuple = None,
         exit: tuple = None
     ) -> str:
         """
-        Renders the maze with ULTRA-WIDE cells (6 chars wide)
+        Renders the maze with ULTRA-WIDE cells (6 chars wide).
+        pattern_mask is a [y, x] boolean array flagging '42' cells.
         """
-        if pattern_coords is None:
-            pattern_coords = set()
-
-        NORTH, SOUTH, WEST = 1, 4, 8
-        height = len(grid)
-        width = len(grid[0]) if height > 0 else 0
-
-        output_lines = []
+        return self.canvas_text(
+            self.thick_canvas(grid, pattern_mask, entry, exit))
 
-        BLOCK = '█'
-        SPACE = ' '
-        P42 = '▒'
-        BODY_WIDTH = 5
+    @staticmethod
+    def thick_size(width: int, height: int) -> tuple:
+        """(columns, lines) of the render_thick frame of a maze."""
+        return 6 * width + 1, 2 * height + 1
 
-        # Centered markers for 5-space width
-        ENTRY_MARKER = '  ●  '
-        EXIT_MARKER = '  ◉  '
-
-        for y in range(height):
-            line_top = ""
-            line_bot = ""
-
-            for x in range(width):
-                cell = grid[y][x]
-                is_42 = (x, y) in pattern_coords
-
-                # --- Determine Center Content ---
-                if (x, y) == entry:
-                    center_char = ENTRY_MARKER
-                elif (x, y) == exit:
-                    center_char = EXIT_MARKER
-                else:
-                    center_char = SPACE * BODY_WIDTH
-
-                wall_brush = P42 if is_42 else BLOCK
-
-                # --- Top Half ---
-                line_top += wall_brush  # Corner (1 char)
-
-                if is_42:
-                    line_top += wall_brush * BODY_WIDTH
-                else:
-                    # North Wall or Open Space
-                    if cell & NORTH:
-                        line_top += BLOCK * BODY_WIDTH
-                    else:
-                        line_top += SPACE * BODY_WIDTH
-
-                # --- Bottom Half ---
-                # West Wall (1 char)
-                if is_42:
-                    line_bot += wall_brush
-                else:
-                    line_bot += BLOCK if (cell & WEST) else SPACE
-
-                # Center Body (5 chars)
-                if is_42:
-                    line_bot += wall_brush * BODY_WIDTH
-                else:
-                    line_bot += center_char
-
-            # Close Right Edge
-            line_top += BLOCK
-            if is_42 and (width-1, y) in pattern_coords:
-                line_bot += P42
-            else:
-                line_bot += BLOCK if (grid[y][width - 1] & 2) else SPACE
-
-            output_lines.append(line_top)
-            output_lines.append(line_bot)
+    def thick_canvas(
+        self,
+        grid: np.ndarray,
+        pattern_mask: np.ndarray = None,
+        entry: tuple = None,
+        exit: tuple = None
+    ) -> np.ndarray:
+        """
+        Draws the render_thick frame into a 2D character array, which
+        patch_thick can then update cell by cell.
+        """
+        EAST, SOUTH = 2, 4
+        grid = np.asarray(grid, dtype=np.uint8)
+        height, width = grid.shape
+        is_42 = self._pattern_mask(grid, pattern_mask)
+
+        # --- One preallocated character canvas for the whole frame ---
+        # Each text row is 6 chars per cell, the right edge, then '\n'.
+        canvas = np.empty((2 * height + 1, 6 * width + 2), dtype='U1')
+        canvas[:, -1] = '\n'
+        # [y, top/bottom half, x, char] view of the cell area
+        cells = canvas[:-1, :-2].reshape(height, 2, width, 6)
+
+        # --- Every cell in one gather, [y, x, half] -> [y, half, x] ---
+        glyphs = self.THICK_CELL_LUT[np.where(is_42, 16, grid & 0xF)]
+        cells[:] = glyphs.transpose(0, 2, 1, 3)
+        self._draw_markers(cells, is_42, entry, exit)
+
+        # Close Right Edge
+        canvas[0:-1:2, -2] = self.BLOCK
+        canvas[1:-1:2, -2] = np.where(
+            is_42[:, -1], self.P42,
+            np.where(grid[:, -1] & EAST, self.BLOCK, self.SPACE))
 
         # --- Dynamic Bottom Closure ---
-        bottom_line = ""
-        for x in range(width):
-            bottom_line += BLOCK  # Corner
-
-            cell = grid[height - 1][x]
-            is_42 = (x, height - 1) in pattern_coords
-
-            if is_42:
-                bottom_line += P42 * BODY_WIDTH
-            else:
-                if cell & SOUTH:
-                    bottom_line += BLOCK * BODY_WIDTH
-                else:
-                    bottom_line += SPACE * BODY_WIDTH
-
-        bottom_line += BLOCK  # Final Corner
-        output_lines.append(bottom_line)
+        canvas[-1, :-2] = self.THICK_FLOOR_LUT[
+            np.where(is_42[-1], 2, (grid[-1] & SOUTH) >> 2)].ravel()
+        canvas[-1, -2] = self.BLOCK  # Final Corner
+        return canvas
 
-        return "\n".join(output_lines)
+    def patch_thick(
+        self,
+        canvas: np.ndarray,
+        grid: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        pattern_mask: np.ndarray = None,
+        entry: tuple = None,
+        exit: tuple = None
+    ) -> None:
+        """
+        Redraws only the cells (xs[i], ys[i]) of a thick_canvas frame,
+        so the cost follows the number of changed cells, not the maze.
+        """
+        EAST, SOUTH = 2, 4
+        grid = np.asarray(grid, dtype=np.uint8)
+        height, width = grid.shape
+        is_42 = self._pattern_mask(grid, pattern_mask)
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+
+        cells = canvas[:-1, :-2].reshape(height, 2, width, 6)
+        cells[ys, :, xs] = self.THICK_CELL_LUT[
+            np.where(is_42[ys, xs], 16, grid[ys, xs] & 0xF)]
+        self._draw_markers(cells, is_42, entry, exit)
+
+        # Right edge of patched cells in the last column
+        edge_y = ys[xs == width - 1]
+        canvas[2 * edge_y + 1, -2] = np.where(
+            is_42[edge_y, -1], self.P42,
+            np.where(grid[edge_y, -1] & EAST, self.BLOCK, self.SPACE))
+
+        # Bottom closure under patched cells in the last row
+        floor_x = xs[ys == height - 1]
+        canvas[-1, :-2].reshape(width, 6)[floor_x] = self.THICK_FLOOR_LUT[
+            np.where(is_42[-1, floor_x], 2,
+                     (grid[-1, floor_x] & SOUTH) >> 2)]
+
+    def thick_highlights(self, canvas: np.ndarray) -> list:
+        """
+        (start, end, glyph) offsets of the '42' runs and the entry/exit
+        markers in the text of a thick_canvas, read off the canvas so the
+        string never has to be scanned for them.
+        """
+        # Same layout as canvas_text; U1 chars compare as code points
+        codes = canvas.ravel()[:-1].view(np.uint32)
+        gold = np.zeros(codes.size + 2, dtype=np.int8)
+        gold[1:-1] = codes == ord(self.P42)
+        edges = np.flatnonzero(np.diff(gold))
+        highlights = [(int(start), int(end), self.P42)
+                      for start, end in zip(edges[::2], edges[1::2])]
+        for marker in (self.ENTRY_MARKER, self.EXIT_MARKER):
+            glyph = marker.strip()
+            highlights += [(int(i), int(i) + 1, glyph)
+                           for i in np.flatnonzero(codes == ord(glyph))]
+        highlights.sort()
+        return highlights
+
+    @staticmethod
+    def canvas_text(canvas: np.ndarray) -> str:
+        """Reads a character canvas back as one string."""
+        # Drop the final newline
+        text = canvas.ravel()[:-1]
+        return str(text.view(f'U{text.size}')[0])
+
+    @staticmethod
+    def _pattern_mask(
+            grid: np.ndarray, pattern_mask: np.ndarray) -> np.ndarray:
+        if pattern_mask is None:
+            return np.zeros(grid.shape, dtype=bool)
+        return np.asarray(pattern_mask, dtype=bool)
+
+    def _draw_markers(
+        self,
+        cells: np.ndarray,
+        is_42: np.ndarray,
+        entry: tuple,
+        exit: tuple
+    ) -> None:
+        """
+        Markers replace the body of a normal cell, never a '42' cell.
+        Exit goes first so the entry wins if both share a cell.
+        """
+        for point, marker in ((exit, self.EXIT_MARKER),
+                              (entry, self.ENTRY_MARKER)):
+            if point is None:
+                continue
+            x, y = point
+            if not is_42[y, x]:
+                cells[y, 1, x, 1:] = list(marker)
@@ -1,10 +1,31 @@
+import threading
+import time
+
+import numpy as np
+from textual import work
 from textual.app import App, ComposeResult
+from textual.message import Message
 from textual.widgets import Header, Footer, Static
 from .ascii_renderer import ASCIIVisualizer
-from rich.text import Text
+from rich.text import Span, Text
+
+# Glyph highlights: '42' pattern (gold), entry dot, exit dot
+_STYLES = {
+    "▒": "bold #FFD700",
+    "●": "bold #00BFFF",
+    "◉": "bold #FF4500",
+}
 
 
 class MazeApp(App):
+    class GenerationDone(Message):
+        """Posted by the generation worker once the new maze is ready."""
+
+        def __init__(self, request: int, animate: bool) -> None:
+            super().__init__()
+            self.request = request
+            self.animate = animate
+
     CSS = """
     Screen {
         overflow: auto;
@@ -12,8 +33,7 @@ class MazeApp(App):
         background: #111;
     }
     .maze {
-        width: auto;
-        height: auto;
+        /* width and height are pinned to the maze in on_mount */
         border: heavy white;
         background: #000;
         color: #44cc44;
@@ -29,20 +49,30 @@ class MazeApp(App):
         ("a", "animate_gen", "Animate Gen")
     ]
 
-    COLORS = [
+    COLORS = (
         "#44cc44",  # Green
         "#00ffff",  # Cyan
         "#ff0055",  # Red
         "#aa00ff",  # Purple
         "#ffff00",  # Yellow
         "#ffffff",  # White
-    ]
+    )
+
+    # Target number of rendered frames for one animation
+    ANIMATION_FRAMES = 200
+    # Seconds per animation frame, including the frame's own work
+    FRAME_INTERVAL = 0.05
 
-    def __init__(self, generator, entry, exit_point, is_perfect=True):
+    def __init__(self, generator, entry, exit_point, is_perfect=True,
+                 output_file=None, verbose=False):
         super().__init__()
         self.generator = generator
         self.entry = entry
         self.exit_point = exit_point
+        self.output_file = output_file
+        # Animation start/end toasts (MAZE_VERBOSE=1 in a_maze_ing.py);
+        # the color, warnings and errors are always shown
+        self.verbose = verbose
         self.visualizer = ASCIIVisualizer()
         self.current_color_index = 0
         self.is_perfect = is_perfect
@@ -51,67 +81,174 @@ class MazeApp(App):
         self.timer = None
         self.display_grid = []
         self.step_index = 0
+        self.batch_size = 1
+        # Animation's own display buffer, reused across runs; never the
+        # generator grid, which display_grid aliases between animations
+        self._anim_grid = None
+
+        # Last rendered frame, reused when only the color changes.
+        # Keyed by (generation, step_index): which maze, how far along.
+        self._generation = 0
+        self._cached_raw = None
+        self._cached_key = None
+        # Styled Text of that frame once shown, so 'c' only swaps its style
+        self._styled_maze = None
+        # Character canvas of that frame, patched in place while animating
+        self._canvas = None
+        # Set when ticks skipped drawing because the maze was off screen
+        self._frame_dirty = False
+        # The maze Static, looked up once in on_mount
+        self._maze_widget = None
+
+        # Background generation: only the latest request is shown, and
+        # the lock keeps two worker threads off the generator at once
+        self._generate_request = 0
+        self._generate_lock = threading.Lock()
 
     def compose(self) -> ComposeResult:
         yield Header()
 
         # Initial Rendering
         self.generator.generate(perfect=self.is_perfect)
+        self._generation += 1
         self.generator.set_entry_exit(self.entry, self.exit_point)
+        self._save_maze()
 
         if self.generator.pattern_42_failed:
             self.notify("Warning: Maze too small for '42' pattern!",
                         severity="warning", timeout=5)
 
         grid = self.generator.get_grid()
-        self.display_grid = [row[:] for row in grid]
+        # Aliased, not copied: display_grid is only written to while
+        # animating, and action_animate_gen gives it its own buffer first
+        self.display_grid = grid
+
+        maze_str = self._render_maze(grid)
+        yield Static(self._styled(maze_str), classes="maze",
+                     id="maze_display")
+
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self._maze_widget = self.query_one("#maze_display", Static)
+        self._size_maze_widget()
+
+    def _size_maze_widget(self) -> None:
+        """
+        Pins the maze widget to the frame size (plus border and padding),
+        so frame updates can skip measuring the content and the layout.
+        The generator's dimensions never change, so this runs once.
+        """
+        cols, lines = self.visualizer.thick_size(
+            self.generator.width, self.generator.height)
+        gutter = self._maze_widget.styles.gutter
+        self._maze_widget.styles.width = cols + gutter.width
+        self._maze_widget.styles.height = lines + gutter.height
 
-        maze_str = self.visualizer.render_thick(
+    def _render_maze(self, grid) -> str:
+        """render_thick for the current maze, remembered for 'c'."""
+        self._canvas = self.visualizer.thick_canvas(
             grid,
-            self.generator.pattern_42_coords,
+            self.generator.pattern_mask,
             entry=self.entry,
             exit=self.exit_point
         )
+        return self._remember_frame()
 
+    def _patch_maze(self, xs, ys) -> str:
+        """Redraws only cells (xs, ys) of the display grid's frame."""
+        self.visualizer.patch_thick(
+            self._canvas,
+            self.display_grid,
+            xs,
+            ys,
+            self.generator.pattern_mask,
+            entry=self.entry,
+            exit=self.exit_point
+        )
+        return self._remember_frame()
+
+    def _remember_frame(self) -> str:
+        maze_str = self.visualizer.canvas_text(self._canvas)
+        self._cached_raw = maze_str
+        self._cached_key = (self._generation, self.step_index)
+        self._styled_maze = None
+        return maze_str
+
+    def _styled(self, maze_str: str) -> Text:
+        """
+        Maze text in the current color, with its highlights. maze_str is
+        the text of self._canvas, which gives the highlight offsets.
+        """
         current_color = self.COLORS[self.current_color_index]
-        styled_maze = Text(maze_str, style=current_color)
-        styled_maze.highlight_regex(
-            r"▒+", "bold #FFD700")  # Gold color for 42\
-        styled_maze.highlight_regex(r"●", "bold #00BFFF")
-        styled_maze.highlight_regex(r"◉", "bold #FF4500")
-        yield Static(styled_maze, classes="maze", id="maze_display")
+        spans = [
+            Span(start, end, _STYLES[glyph])
+            for start, end, glyph
+            in self.visualizer.thick_highlights(self._canvas)
+        ]
+        styled_maze = Text(maze_str, style=current_color, spans=spans)
+        self._styled_maze = styled_maze
+        return styled_maze
 
-        yield Footer()
+    def _render_and_push(self, maze_str: str) -> None:
+        """Styles maze_str and shows it in the maze widget."""
+        self._maze_widget.update(self._styled(maze_str), layout=False)
+
+    def _save_maze(self) -> None:
+        """Streams the current maze to OUTPUT_FILE, if one is set."""
+        if not self.output_file:
+            return
+        try:
+            with open(self.output_file, 'w', buffering=1 << 16) as f:
+                self.visualizer.render_to(self.generator.get_grid(), f)
+        except OSError as e:
+            self.notify(f"Could not write '{self.output_file}': {e}",
+                        severity="error", timeout=5)
 
     def action_regenerate(self) -> None:
         """Instant regeneration (no animation)."""
-        self.generator.generate(perfect=self.is_perfect)
-        self.generator.set_entry_exit(self.entry, self.exit_point)
+        # A running animation would keep writing into display_grid,
+        # which is about to alias the generator's grid
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+        self._start_generation(animate=False)
+
+    def _start_generation(self, animate: bool) -> None:
+        self._generate_request += 1
+        self._generate_maze(self._generate_request, animate)
 
+    @work(thread=True, exclusive=True)
+    def _generate_maze(self, request: int, animate: bool) -> None:
+        """Runs the generator off the UI thread."""
+        with self._generate_lock:
+            # Superseded while waiting for the lock: skip the work
+            if request != self._generate_request:
+                return
+            self.generator.generate(perfect=self.is_perfect)
+            self.generator.set_entry_exit(self.entry, self.exit_point)
+        self.post_message(self.GenerationDone(request, animate))
+
+    def on_maze_app_generation_done(self, message: GenerationDone) -> None:
+        # A newer request is already on its way
+        if message.request != self._generate_request:
+            return
+        self._generation += 1
+        self._save_maze()
+        if message.animate:
+            self._start_animation()
+        else:
+            self._show_generated()
+
+    def _show_generated(self) -> None:
         if self.generator.pattern_42_failed:
             self.notify("Warning: Maze too small for '42' pattern!",
                         severity="warning", timeout=5)
 
         grid = self.generator.get_grid()
-        self.display_grid = [row[:] for row in grid]  # Sync display grid
+        self.display_grid = grid  # Sync display grid (aliased)
 
-        new_maze_str = self.visualizer.render_thick(
-            grid,
-            self.generator.pattern_42_coords,
-            entry=self.entry,
-            exit=self.exit_point
-        )
-
-        # Apply current color
-        current_color = self.COLORS[self.current_color_index]
-        styled_maze = Text(new_maze_str, style=current_color)
-        # 42 embeded pattern color
-        styled_maze.highlight_regex(r"▒+", "bold #FFD700")
-        # entry dot color
-        styled_maze.highlight_regex(r"●", "bold #00BFFF")
-        # exit dot color
-        styled_maze.highlight_regex(r"◉", "bold #FF4500")
-        self.query_one("#maze_display", Static).update(styled_maze)
+        self._render_and_push(self._render_maze(grid))
 
     def action_toggle_color(self) -> None:
         """Called when user presses 'c'."""
@@ -119,71 +256,94 @@ class MazeApp(App):
             self.current_color_index + 1) % len(self.COLORS)
         new_color = self.COLORS[self.current_color_index]
         self.notify(f"Color: {new_color}")
-        if not self.display_grid:
+        if len(self.display_grid) == 0:
             self.display_grid = self.generator.get_grid()
 
-        raw_maze_str = self.visualizer.render_thick(
-            self.display_grid,
-            self.generator.pattern_42_coords,
-            entry=self.entry,
-            exit=self.exit_point
-        )
-
-        styled_maze = Text(raw_maze_str, style=new_color)
-        styled_maze.highlight_regex(r"▒+", "bold #FFD700")
-        styled_maze.highlight_regex(r"●", "bold #00BFFF")
-        styled_maze.highlight_regex(r"◉", "bold #FF4500")
+        # Same grid as the frame on screen: only the color differs
+        if self._cached_key == (self._generation, self.step_index):
+            if self._styled_maze is not None:
+                # Highlight spans keep their offsets; swap the base style
+                self._styled_maze.style = new_color
+                self._maze_widget.update(self._styled_maze, layout=False)
+                return
+            raw_maze_str = self._cached_raw
+        else:
+            raw_maze_str = self._render_maze(self.display_grid)
 
-        self.query_one("#maze_display", Static).update(styled_maze)
+        self._render_and_push(raw_maze_str)
 
     def action_animate_gen(self) -> None:
         """Starts the animation process."""
-        self.notify("Starting Animation...")
+        if self.verbose:
+            self.notify("Starting Animation...")
 
         # 1. Stop any existing timer
         if self.timer:
             self.timer.stop()
-        # 2. Reset the Generator (Calculate the full path instantly)
-        self.generator.generate(perfect=self.is_perfect)
-        self.generator.set_entry_exit(self.entry, self.exit_point)
+            self.timer = None
+        # 2. Reset the Generator (Calculate the full path in a worker)
+        self._start_generation(animate=True)
+
+    def _start_animation(self) -> None:
+        """Back on the UI thread once the animated maze is generated."""
         # 3. Reset the Display Grid to 'Blank Canvas' (All Walls = 15)
         w, h = self.generator.width, self.generator.height
-        self.display_grid = [[15 for _ in range(w)] for _ in range(h)]
+        if self._anim_grid is None or self._anim_grid.shape != (h, w):
+            self._anim_grid = np.empty((h, w), dtype=np.uint8)
+        self._anim_grid.fill(15)
+        self.display_grid = self._anim_grid
         self.step_index = 0
-        # 4. Start the Timer (Calls 'on_timer_tick' every 0.05 seconds)
+        # Blank frame that each tick patches
+        self._render_maze(self.display_grid)
+        self._frame_dirty = False
+        # History steps drawn per tick, so long histories still finish
+        # in roughly ANIMATION_FRAMES ticks
+        self.batch_size = max(
+            1, len(self.generator.history_array) // self.ANIMATION_FRAMES)
+        # 4. Start the Timer (each tick schedules the next one)
         # Faster = 0.01, Slower = 0.1
-        self.timer = self.set_interval(0.05, self.on_timer_tick)
+        self.timer = self.set_timer(self.FRAME_INTERVAL, self.on_timer_tick)
 
     def on_timer_tick(self) -> None:
         """Called repeatedly by the timer to draw the next step."""
-        history = self.generator.history
+        started = time.perf_counter()
+        history = self.generator.history_array
         # Check if complete
         if self.step_index >= len(history):
             self.timer.stop()
             self.timer = None
-            self.notify("Animation Complete!")
+            if self._frame_dirty:
+                # Leave the finished maze behind, not a skipped frame
+                self._frame_dirty = False
+                self._render_and_push(self._render_maze(self.display_grid))
+            if self.verbose:
+                self.notify("Animation Complete!")
             return
-        # 1. Get the next update from history
-        updates = history[self.step_index]
-        # 2. Apply updates to our DISPLAY grid
-        for (x, y, new_value) in updates:
-            self.display_grid[y][x] = new_value
-        # 3. Render
-        # --- UPDATE 1: Pass coords ---
-        maze_str = self.visualizer.render_thick(
-            self.display_grid,
-            self.generator.pattern_42_coords,
-            entry=self.entry,
-            exit=self.exit_point
-
-        )
-        # 4. Apply Color and Update
-        current_color = self.COLORS[self.current_color_index]
-        styled_maze = Text(maze_str, style=current_color)
-        styled_maze.highlight_regex(r"▒+", "bold #FFD700")
-        styled_maze.highlight_regex(r"●", "bold #00BFFF")
-        styled_maze.highlight_regex(r"◉", "bold #FF4500")
-
-        self.query_one("#maze_display", Static).update(styled_maze)
-        # Move to next frame
-        self.step_index += 1
+        # 1. Get the next batch from history: rows of (x1, y1, g1, x2, y2, g2)
+        end = min(self.step_index + self.batch_size, len(history))
+        cells = history[self.step_index:end].reshape(-1, 3)
+        # 2. Apply the batch to our DISPLAY grid. Walls are only ever
+        # removed, so AND-ing every recorded value gives the latest one
+        # regardless of order.
+        np.bitwise_and.at(
+            self.display_grid, (cells[:, 1], cells[:, 0]), cells[:, 2])
+        # Move to next frame (before rendering, so the cached frame is
+        # keyed by the step it actually shows)
+        self.step_index = end
+        # 3. Off screen: skip drawing, and redraw in full once visible
+        if not self._maze_widget.region.overlaps(self.screen.region):
+            self._frame_dirty = True
+        else:
+            # 4. Render, redrawing only the cells this batch touched
+            if self._frame_dirty:
+                self._frame_dirty = False
+                maze_str = self._render_maze(self.display_grid)
+            else:
+                maze_str = self._patch_maze(cells[:, 0], cells[:, 1])
+            # 5. Apply Color and Update
+            self._render_and_push(maze_str)
+        # 6. Schedule the next frame for what is left of the interval, so
+        # slow frames never pile up behind each other and starve input
+        elapsed = time.perf_counter() - started
+        self.timer = self.set_timer(
+            max(0.01, self.FRAME_INTERVAL - elapsed), self.on_timer_tick)